@@ -1,13 +1,23 @@
 # Configuration and imports
 import os
+import re
 import json
-import pandas as pd
+import asyncio
+import hashlib
+import tempfile
+import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
 from datetime import datetime
 import logging
 
+# Optional C-accelerated ISO-8601 parser (~50x faster than
+# datetime.fromisoformat); fall back to the stdlib when unavailable.
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,6 +25,10 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Fast-path check for ISO-8601 timestamps; a regex match is far cheaper
+# than a full datetime parse when we only need a yes/no answer.
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})$")
+
 # Sample email dataset
 sample_emails = [
     {
@@ -56,40 +70,284 @@ sample_emails = [
 
 
 class EmailProcessor:
-    def __init__(self):
-        """Initialize the email processor with OpenAI API key."""
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    _REQUIRED_FIELDS = ("id", "from", "subject", "body", "timestamp")
+
+    # Response templates are static apart from the sender, so they are
+    # built once at class definition and filled in with str.format.
+    _RESPONSE_TEMPLATES = {
+        "complaint": " Dear {sender}, \n\n"
+                    "We're are sorry to hear about your experince. Our support team is already looking into this issue."
+                    "We truly care about your complaint and aim to resolve this as quickly as possible.\n\nBest Regards,\nSupport Team",
+
+        "inquiry": "Hi {sender}!,\n\n"
+                   "Thank you for reaching out with your question. We will get back to you shortly with the requested information.\n\nBest Regards,\nCustomer Experience Team",
+
+        "feedback": "Hi {sender}!,\n\n"
+                    "Thank you for your feedback! We appreciate your input and will take it into consideration. We are always thrilled to satisfy out customers.\n\n"
+                    "We will make sure to pass this along to the team.\n\nBest Regards,\nCustomer Success Team",
+
+        "support_request": "Hi {sender}!,\n\n"
+                           "Thank you for reaching out and letting us know about your issues. Out technical team will review your case and follow up as soon as possible.\n\nBest Regards,\n Tech Support Team",
+        "other": "Hi {sender}!,\n\n"
+                 "Thank you for reaching out, We have received your message and will direct it to the right team. You'll hear from us soon.\n\nBest Regards,\nGeneral Inquiries Team"
+    }
+
+    def __init__(self, use_local_model: bool = False):
+        """
+        Initialize the email processor with OpenAI API key.
+
+        With use_local_model=True, classification runs on a local
+        zero-shot transformer (requires transformers + torch) instead of
+        the OpenAI API, trading a ~300ms network round-trip per email for
+        a ~20ms local forward pass with no rate limits.
+        """
+        # Imported here so merely importing this module (e.g. for
+        # validate_email in a service) doesn't pay the openai import cost.
+        import httpx
+        from openai import AsyncOpenAI
+
+        # One shared HTTP/2 client: concurrent classification calls
+        # multiplex over kept-alive connections instead of paying a TCP+TLS
+        # handshake each time the default per-client pool churns.
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self._http
+        )
+
+        self.model = "gpt-4o-mini"
+
+        self.use_local_model = use_local_model
+        self.local_model = "facebook/bart-large-mnli"
+        self._zsl = None  # zero-shot pipeline, built lazily on first use
+
+        # Limit how many classification calls are in flight at once
+        self.semaphore = asyncio.Semaphore(10)
+
+        # Exact-match classification cache: with temperature=0 an identical
+        # prompt always yields the same label, so repeat emails skip the API.
+        self._cache: Dict[str, str] = {}
+
+        # Semantic cache: embeddings of already-classified emails, so
+        # near-duplicates (paraphrased complaints etc.) reuse the label
+        # for the cost of an embedding call instead of a chat completion.
+        # Vectors live in one 2-D matrix that grows by doubling, so each
+        # lookup is a single matmul over the filled rows with no restacking.
+        self.embed_model = "text-embedding-3-small"
+        self.similarity_threshold = 0.87
+        self._emb_matrix: Optional[np.ndarray] = None
+        self._emb_count = 0
+        self._emb_labels: List[str] = []
 
         # Define valid categories
-        self.valid_categories = {
+        self.valid_categories = frozenset({
             "complaint", "inquiry", "feedback",
             "support_request", "other"
+        })
+
+        # Sorted so the joined string (and any prompt built from it) is
+        # byte-for-byte stable across set ordering and process restarts.
+        self._category_labels = sorted(self.valid_categories)
+        self._categories_str = ", ".join(self._category_labels)
+
+        # Static instructions live in a system message built once, so every
+        # request shares the same prefix and OpenAI's automatic prompt cache
+        # can hit on the prefill; only the email itself varies per call.
+        self._system_prompt = (
+            "You are an intelligent email customer support assistant. "
+            f"Your task is to classify each email you receive into exactly one of the following categories: {self._categories_str}.\n\n"
+            "Category definitions:\n"
+            "- complaint: the sender is dissatisfied or upset about a product, order, "
+            "or service, e.g. damaged goods, refund demands, poor service experiences.\n"
+            "- inquiry: the sender is asking a question about products, pricing, "
+            "availability, compatibility, or company information before or after a purchase.\n"
+            "- feedback: the sender is sharing an opinion, praise, or suggestions "
+            "about their experience without requesting any action.\n"
+            "- support_request: the sender needs technical help with installing, "
+            "configuring, or using a product, e.g. error codes, setup problems.\n"
+            "- other: anything that does not fit the categories above, e.g. "
+            "partnership proposals, job applications, spam.\n\n"
+            'Respond with a JSON object of the form {"category": "<name>"}.\n'
+        )
+
+        # Constrained decoding: the schema's enum means the model can only
+        # emit one of the valid categories, so no rejection path is needed.
+        self._response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "email_category",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "category": {
+                            "type": "string",
+                            "enum": self._category_labels
+                        }
+                    },
+                    "required": ["category"],
+                    "additionalProperties": False
+                },
+                "strict": True
+            }
         }
 
+    async def aclose(self):
+        """Release the shared HTTP connection pool."""
+        await self._http.aclose()
+
     def validate_email(self, email: Dict) -> Tuple[bool, Optional[str]]:
         """
         Validate the email format and content.
         """
-        required_fields = ["id", "from", "subject", "body", "timestamp"]
-
-        for field in required_fields:
+        for field in self._REQUIRED_FIELDS:
             if field not in email:
                 return False, f"Missing field: {field}"
-            
+
             if not isinstance(email[field], str):
                 return False, f"Invalid value for field: {field}"
-            
-        try:
-            datetime.fromisoformat(email["timestamp"].replace("Z", "+00:00"))   
 
-        except ValueError:
-            return False, "Invalid timestamp format"
-        
+        # Regex accepts the common ISO-8601 shapes without the allocation
+        # cost of a full parse; anything else gets the strict parser.
+        if not _ISO_RE.match(email["timestamp"]):
+            try:
+                if ciso8601 is not None:
+                    ciso8601.parse_datetime(email["timestamp"])
+                else:
+                    datetime.fromisoformat(email["timestamp"].replace("Z", "+00:00"))
+
+            except ValueError:
+                return False, "Invalid timestamp format"
+
         return True, None
             
 
 
-    def classify_email(self, email: Dict) -> Optional[str]:
+    def _cache_key(self, messages: List[Dict]) -> str:
+        """Deterministic cache key over the full request parameters."""
+        return hashlib.sha256(
+            json.dumps(
+                {"m": self.model, "p": messages, "t": 0},
+                sort_keys=True
+            ).encode()
+        ).hexdigest()
+
+    async def _embed_email(self, email: Dict) -> Optional[np.ndarray]:
+        """Embed subject+body as a unit-length vector, or None on failure."""
+        try:
+            async with self.semaphore:
+                response = await self.client.embeddings.create(
+                    model=self.embed_model,
+                    input=f"{email.get('subject')}\n{email.get('body')}"
+                )
+            v = np.asarray(response.data[0].embedding)
+            return v / np.linalg.norm(v)
+
+        except Exception as e:
+            logger.warning("Embedding failed for email %s: %s", email['id'], e)
+            return None
+
+    def _semantic_lookup(self, v: np.ndarray) -> Optional[str]:
+        """Return the cached label of the nearest embedding above threshold."""
+        if self._emb_count == 0:
+            return None
+
+        sims = self._emb_matrix[:self._emb_count] @ v
+        best = int(sims.argmax())
+        if sims[best] >= self.similarity_threshold:
+            return self._emb_labels[best]
+        return None
+
+    def _semantic_store(self, v: np.ndarray, category: str):
+        """Add an embedding/label pair, doubling the matrix when full."""
+        if self._emb_matrix is None:
+            self._emb_matrix = np.empty((8, v.shape[0]))
+        elif self._emb_count == self._emb_matrix.shape[0]:
+            grown = np.empty((self._emb_count * 2, v.shape[0]))
+            grown[:self._emb_count] = self._emb_matrix
+            self._emb_matrix = grown
+
+        self._emb_matrix[self._emb_count] = v
+        self._emb_count += 1
+        self._emb_labels.append(category)
+
+    def _get_zsl_pipeline(self):
+        """Lazily build the local zero-shot classification pipeline."""
+        if self._zsl is None:
+            import torch
+            import transformers
+
+            self._zsl = transformers.pipeline(
+                "zero-shot-classification",
+                model=self.local_model,
+                device=0 if torch.cuda.is_available() else -1
+            )
+        return self._zsl
+
+    def _classify_local(self, email: Dict) -> Optional[str]:
+        """Classify an email with the local zero-shot model."""
+        try:
+            out = self._get_zsl_pipeline()(
+                f"{email.get('subject')}. {email.get('body')}",
+                candidate_labels=self._category_labels
+            )
+            category = out["labels"][0]
+            logger.info("Email %s classified as: %s (local)", email['id'], category)
+            return category
+
+        except Exception as e:
+            logger.error("Error during local classification for email %s: %s", email['id'], e)
+            return None
+
+    def _classify_local_batch(self, emails: List[Dict]) -> List[Optional[str]]:
+        """Classify emails with the local model in one batched forward pass."""
+        try:
+            texts = [f"{e.get('subject')}. {e.get('body')}" for e in emails]
+            outs = self._get_zsl_pipeline()(
+                texts,
+                candidate_labels=self._category_labels,
+                batch_size=32
+            )
+            return [out["labels"][0] for out in outs]
+
+        except Exception as e:
+            logger.error("Error during local batch classification: %s", e)
+            return [None] * len(emails)
+
+    async def classify_emails(self, emails: List[Dict]) -> List[Optional[str]]:
+        """
+        Classify a list of emails, batching where the backend allows it.
+
+        The local model processes the whole list in one forward pass,
+        amortizing tokenizer and kernel-launch overhead; the API backend
+        falls back to concurrent per-email calls.
+        """
+        if self.use_local_model:
+            return self._classify_local_batch(emails)
+
+        return list(await asyncio.gather(
+            *[self.classify_email(email) for email in emails]
+        ))
+
+    def _build_messages(self, email: Dict) -> List[Dict]:
+        """
+        Build the classification messages for a single email.
+
+        The static system prompt sits first and the variable email content
+        last, so the cacheable request prefix is identical across emails.
+        """
+        return [
+            {"role": "system", "content": self._system_prompt},
+            {
+                "role": "user",
+                "content": f"Subject: {email.get('subject')}\nBody: {email.get('body')}"
+            }
+        ]
+
+    async def classify_email(self, email: Dict) -> Optional[str]:
         """
         Classify an email using LLM.
         Returns the classification category or None if classification fails.
@@ -100,37 +358,124 @@ class EmailProcessor:
         3. Validate and return the classification
         """
 
-        prompt = ( 
-
-            f"You are an intelligent email customer support assistant. Your task is to classify the following email into one of the categories: {', '.join(self.valid_categories)}.\n\n"
-            f"Email Subject: {email.get('subject')}\n"
-            f"Email Body: {email.get('body')}\n\n"
-            f"Respond with only category name in lowercase.\n"
-        )
+        if self.use_local_model:
+            return self._classify_local(email)
+
+        messages = self._build_messages(email)
+
+        cache_key = self._cache_key(messages)
+        if cache_key in self._cache:
+            category = self._cache[cache_key]
+            logger.info("Email %s classified as: %s (cached)", email['id'], category)
+            return category
+
+        embedding = await self._embed_email(email)
+        if embedding is not None:
+            category = self._semantic_lookup(embedding)
+            if category is not None:
+                # Backfill the exact-match cache so a byte-identical repeat
+                # skips even the embedding call next time.
+                self._cache[cache_key] = category
+                logger.info("Email %s classified as: %s (semantic cache)", email['id'], category)
+                return category
 
         try:
 
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature = 0
-            )
+            async with self.semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature = 0,
+                    response_format=self._response_format,
+                    max_tokens=10
+                )
 
-            category = response.choices[0].message.content.strip().lower()
+            category = json.loads(response.choices[0].message.content)["category"]
 
             if category in self.valid_categories:
-                logger.info(f"Email {email['id']} classified as: {category}")
+                self._cache[cache_key] = category
+                if embedding is not None:
+                    self._semantic_store(embedding, category)
+                logger.info("Email %s classified as: %s", email['id'], category)
                 return category
             else:
-                logger.warning(f"Invalid classification for email {email['id']}: {category}")
+                logger.warning("Invalid classification for email %s: %s", email['id'], category)
                 return None
 
         except Exception as e:
-            logger.error(f"Error during classification for email {email['id']}: {e}")
+            logger.error("Error during classification for email %s: %s", email['id'], e)
             return None
-        
+
+
+    async def classify_batch(self, emails: List[Dict], poll_interval: float = 30.0) -> Dict[str, Optional[str]]:
+        """
+        Classify a set of emails offline via the OpenAI Batch API.
+
+        Suited to bulk/nightly runs: all emails are submitted as one JSONL
+        job (50% cost, higher rate limits) and results arrive within the
+        batch completion window rather than per-request.
+        Returns a mapping of email id -> category (None if classification failed).
+        """
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="w", suffix=".jsonl", delete=False
+            ) as f:
+                for email in emails:
+                    f.write(json.dumps({
+                        "custom_id": email["id"],
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": self._build_messages(email),
+                            "temperature": 0,
+                            "response_format": self._response_format,
+                            "max_tokens": 10
+                        }
+                    }) + "\n")
+                input_path = f.name
+
+            # The JSONL holds customer email bodies; make sure it leaves
+            # /tmp even when the upload fails.
+            try:
+                with open(input_path, "rb") as f:
+                    input_file = await self.client.files.create(file=f, purpose="batch")
+            finally:
+                os.unlink(input_path)
+
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                batch = await self.client.batches.retrieve(batch.id)
+
+            if batch.status != "completed":
+                logger.error("Batch %s finished with status: %s", batch.id, batch.status)
+                return {email["id"]: None for email in emails}
+
+            output = await self.client.files.content(batch.output_file_id)
+
+            classifications: Dict[str, Optional[str]] = {email["id"]: None for email in emails}
+            for line in output.text.splitlines():
+                record = json.loads(line)
+                category = json.loads(
+                    record["response"]["body"]["choices"][0]["message"]["content"]
+                )["category"]
+                if category in self.valid_categories:
+                    classifications[record["custom_id"]] = category
+                else:
+                    logger.warning("Invalid classification for email %s: %s", record['custom_id'], category)
+
+            return classifications
+
+        except Exception as e:
+            logger.error("Error during batch classification: %s", e)
+            return {email["id"]: None for email in emails}
+
 
     def generate_response(self, email: Dict, classification: str) -> Optional[str]:
         """
@@ -141,38 +486,15 @@ class EmailProcessor:
         2. Implement appropriate response templates
         3. Add error handling
         """
-        try:
-            response_templates = {
-                "complaint": f" Dear {email['from'],}, \n\n"
-                            f"We're are sorry to hear about your experince. Our support team is already looking into this issue."
-                            f"We truly care about your complaint and aim to resolve this as quickly as possible.\n\nBest Regards,\nSupport Team",
-
-                "inquiry": f"Hi {email['from']}!,\n\n"
-                           f"Thank you for reaching out with your question. We will get back to you shortly with the requested information.\n\nBest Regards,\nCustomer Experience Team",
-
-                "feedback": f"Hi {email['from']}!,\n\n"
-                            f"Thank you for your feedback! We appreciate your input and will take it into consideration. We are always thrilled to satisfy out customers.\n\n"
-                            f"We will make sure to pass this along to the team.\n\nBest Regards,\nCustomer Success Team",
-
-                "support_request": f"Hi {email['from']}!,\n\n"
-                                   f"Thank you for reaching out and letting us know about your issues. Out technical team will review your case and follow up as soon as possible.\n\nBest Regards,\n Tech Support Team",
-                "other": f"Hi {email['from']}!,\n\n"
-                         f"Thank you for reaching out, We have received your message and will direct it to the right team. You'll hear from us soon.\n\nBest Regards,\nGeneral Inquiries Team" 
-            }
-
-            response = response_templates.get(classification)
-
-            if response:
-                logger.info(f"Generated response for email {email['id']}: {response}")
-                return response
-            
-            else:
-                logger.warning(f"No response template found for classification {classification}.")
-                return None
+        template = self._RESPONSE_TEMPLATES.get(classification)
 
-        except Exception as e:
-            logger.error(f"Error during response generation for email {email['id']}: {e}")
+        if template is None:
+            logger.warning("No response template found for classification %s.", classification)
             return None
+
+        response = template.format(sender=email['from'])
+        logger.info("Generated response for email %s: %s", email['id'], response)
+        return response
         
 
 
@@ -180,16 +502,29 @@ class EmailAutomationSystem:
     def __init__(self, processor: EmailProcessor):
         """Initialize the automation system with an EmailProcessor."""
         self.processor = processor
-        self.response_handlers = {
-            "complaint": self._handle_complaint,
-            "inquiry": self._handle_inquiry,
-            "feedback": self._handle_feedback,
-            "support_request": self._handle_support_request,
-            "other": self._handle_other
-        }
 
-    
-    def process_email(self, email: Dict) -> Dict:
+    def _dispatch(self, email: Dict, classification: str) -> bool:
+        """
+        Route an email to its category handler.
+        Returns True if a handler existed for the classification.
+        """
+        match classification:
+            case "complaint":
+                self._handle_complaint(email)
+            case "inquiry":
+                self._handle_inquiry(email)
+            case "feedback":
+                self._handle_feedback(email)
+            case "support_request":
+                self._handle_support_request(email)
+            case "other":
+                self._handle_other(email)
+            case _:
+                return False
+        return True
+
+
+    async def process_email(self, email: Dict) -> Dict:
         """
         Process a single email through the complete pipeline.
         Returns a dictionary with the processing results.
@@ -213,27 +548,95 @@ class EmailAutomationSystem:
                 result["error"] = error
                 return result
             
-            classification = self.processor.classify_email(email)
+            classification = await self.processor.classify_email(email)
             if not classification:
                 result["error"] = "LLM Classification failed"
                 return result
             
             result["classification"] = classification
 
-            handler = self.response_handlers.get(classification)
-            if handler:
-                handler(email)
+            if self._dispatch(email, classification):
                 result["response_sent"] = True
                 result["success"] = True
             else:
                 result["error"] = f"No handler found for {classification}"
 
-        
+
         except Exception as e:
             result["error"] = str(e)
-    
+
         return result
 
+    async def process_emails(self, emails: List[Dict]) -> List[Dict]:
+        """
+        Process a list of emails as one batch.
+
+        Validates everything first, deduplicates identical subject+body
+        pairs so each unique text is classified exactly once, then
+        dispatches handlers per email (responses still templatize on the
+        individual sender). Returns one result dictionary per input
+        email, in order.
+        """
+        results = [
+            {
+                "email_id": email.get("id"),
+                "success": False,
+                "classification": None,
+                "response_sent": False,
+                "error": None
+            }
+            for email in emails
+        ]
+
+        valid_indices = []
+        for i, email in enumerate(emails):
+            is_valid, error = self.processor.validate_email(email)
+            if is_valid:
+                valid_indices.append(i)
+            else:
+                results[i]["error"] = error
+
+        # Duplicate bodies (forwards, autoresponders, templated complaints)
+        # are common; classify one representative per unique text and fan
+        # the label back out to the rest.
+        key_for_index = {}
+        representatives = {}
+        for i in valid_indices:
+            email = emails[i]
+            key = hashlib.md5(
+                f"{email['subject']}\0{email['body']}".encode()
+            ).digest()
+            key_for_index[i] = key
+            if key not in representatives:
+                representatives[key] = email
+
+        unique_keys = list(representatives)
+        unique_labels = await self.processor.classify_emails(
+            [representatives[key] for key in unique_keys]
+        )
+        label_for_key = dict(zip(unique_keys, unique_labels))
+
+        for i in valid_indices:
+            classification = label_for_key[key_for_index[i]]
+            result = results[i]
+            try:
+                if not classification:
+                    result["error"] = "LLM Classification failed"
+                    continue
+
+                result["classification"] = classification
+
+                if self._dispatch(emails[i], classification):
+                    result["response_sent"] = True
+                    result["success"] = True
+                else:
+                    result["error"] = f"No handler found for {classification}"
+
+            except Exception as e:
+                result["error"] = str(e)
+
+        return results
+
     def _handle_complaint(self, email: Dict):
         """
         Handle complaint emails.
@@ -287,55 +690,98 @@ class EmailAutomationSystem:
 # Mock service functions
 def send_complaint_response(email_id: str, response: str):
     """Mock function to simulate sending a response to a complaint"""
-    logger.info(f"Sending complaint response for email {email_id}")
+    logger.info("Sending complaint response for email %s", email_id)
     # In real implementation: integrate with email service
 
 
 def send_standard_response(email_id: str, response: str):
     """Mock function to simulate sending a standard response"""
-    logger.info(f"Sending standard response for email {email_id}")
+    logger.info("Sending standard response for email %s", email_id)
     # In real implementation: integrate with email service
 
 
 def create_urgent_ticket(email_id: str, category: str, context: str):
     """Mock function to simulate creating an urgent ticket"""
-    logger.info(f"Creating urgent ticket for email {email_id}")
+    logger.info("Creating urgent ticket for email %s", email_id)
     # In real implementation: integrate with ticket system
 
 
 def create_support_ticket(email_id: str, context: str):
     """Mock function to simulate creating a support ticket"""
-    logger.info(f"Creating support ticket for email {email_id}")
+    logger.info("Creating support ticket for email %s", email_id)
     # In real implementation: integrate with ticket system
 
 
 def log_customer_feedback(email_id: str, feedback: str):
     """Mock function to simulate logging customer feedback"""
-    logger.info(f"Logging feedback for email {email_id}")
+    logger.info("Logging feedback for email %s", email_id)
     # In real implementation: integrate with feedback system
 
 
-def run_demonstration():
-    """Run a demonstration of the complete system."""
+async def run_demonstration():
+    """
+    Run a demonstration of the complete system, yielding each email's
+    result as soon as it finishes.
+
+    Streaming via asyncio.as_completed means the first result is
+    available after one round-trip instead of the whole batch's wall
+    time, so downstream consumers (DB writes, metrics) can start
+    immediately. Bulk/offline runs should prefer
+    EmailAutomationSystem.process_emails, which also deduplicates.
+    """
     # Initialize the system
     processor = EmailProcessor()
     automation_system = EmailAutomationSystem(processor)
 
-    # Process all sample emails
-    results = []
-    for email in sample_emails:
-        logger.info(f"\nProcessing email {email['id']}...")
-        result = automation_system.process_email(email)
-        results.append(result)
+    try:
+        for coro in asyncio.as_completed(
+            [automation_system.process_email(email) for email in sample_emails]
+        ):
+            yield await coro
+    finally:
+        await processor.aclose()
+
+
+async def _main(export_csv: Optional[str] = None):
+    """
+    Consume the demonstration stream and print a summary.
+
+    Pass export_csv=<path> to also write the results as CSV (the only
+    path that needs pandas).
+    """
+    # Accumulate columns directly (struct-of-arrays); the CSV export can
+    # hand them to pandas as ready-made typed columns.
+    cols = {
+        "email_id": [],
+        "success": [],
+        "classification": [],
+        "response_sent": [],
+        "error": []
+    }
+    async for result in run_demonstration():
+        logger.info("Finished processing email %s", result["email_id"])
+        for key, values in cols.items():
+            values.append(result[key])
 
-    # Create a summary DataFrame
-    df = pd.DataFrame(results)
+    # Plain-text summary: for a handful of rows, importing pandas and
+    # building a DataFrame costs more than the whole processing loop.
     print("\nProcessing Summary:")
-    print(df[["email_id", "success", "classification", "response_sent"]])
+    print(f"{'email_id':>8} {'success':>8} {'classification':>16} {'response_sent':>14}")
+    for email_id, success, classification, response_sent in zip(
+        cols["email_id"], cols["success"],
+        cols["classification"], cols["response_sent"]
+    ):
+        print(f"{str(email_id):>8} {str(success):>8} {str(classification):>16} {str(response_sent):>14}")
+
+    if export_csv:
+        import pandas as pd
+
+        pd.DataFrame(cols).to_csv(export_csv, index=False)
+        logger.info("Wrote results to %s", export_csv)
 
-    return df
+    return cols
 
 
 # Example usage:
 if __name__ == "__main__":
-    results_df = run_demonstration()
+    results = asyncio.run(_main())